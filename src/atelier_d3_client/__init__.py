@@ -1,16 +1,19 @@
 import os
-import uuid
+import time
 import json
 import base64
+import shutil
 import requests
 import tempfile
+import functools
+import itertools
 from PIL import Image
-from io import BytesIO
-from datetime import datetime
 from selenium import webdriver
 from importlib import resources
 from colorpaws import setup_logger
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.by import By
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
@@ -19,8 +22,21 @@ from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+_VALID_FORMATS = frozenset({'webp', 'jpg'})
+_DRIVER_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'atelier_d3', 'driver_path')
+
+@functools.lru_cache(maxsize=1)
+def _load_preset_cached(preset_path='__dtr__.py') -> tuple:
+    """
+    Read and decode the bundled preset once per process.
+    """
+    with open(resources.path(__name__, preset_path), 'r', encoding="utf-8") as f:
+        preset = json.load(f)
+    
+    return tuple(base64.b64decode(value).decode('utf-8') for value in preset["locale"][:4])
+
 class AtelierD3Client():
-    def __init__(self, log_on=True, log_to=None, save_to="outputs", save_as="webp"):
+    def __init__(self, log_on=True, log_to=None, save_to="outputs", save_as="webp", webp_method=0, max_size=None):
         """
         Initialize Atelier D3 Client module.
 
@@ -29,6 +45,8 @@ class AtelierD3Client():
         - log_to  (str): Directory to save logs.
         - save_to (str): Directory to save outputs.
         - save_as (str): Output format ('webp', 'jpg').
+        - webp_method (int): WebP encoder effort, 0 (fastest) to 6 (smallest).
+        - max_size (int): Longest edge in pixels for WebP outputs (None keeps original size).
         """
         self.logger = setup_logger(
             name=self.__class__.__name__, 
@@ -38,16 +56,23 @@ class AtelierD3Client():
         
         self.version = "25.1"
         
+        self.__session = requests.Session()
+        self.__session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        self.__dl_pool = ThreadPoolExecutor(max_workers=4)
+        self.__task_counter = itertools.count(time.time_ns() // 1000)
+        
         self.__online_check()
         self.__load_preset()
         
-        self.__init_checks(save_to, save_as)
+        self.__init_checks(save_to, save_as, webp_method, max_size)
+        self.__last_url = None
         self.__driver = self.__get_webdriver()
+        self.__driver.set_script_timeout(120)
         self.__authenticate()
         
         self.logger.info(f"Atelier D3 Client is now ready!")
 
-    def __init_checks(self, save_to: str, save_as: str):
+    def __init_checks(self, save_to: str, save_as: str, webp_method: int, max_size: int):
         """
         Initialize essential checks.
         """
@@ -55,23 +80,37 @@ class AtelierD3Client():
             self.save_to = save_to if save_to else tempfile.gettempdir()
             self.save_to = os.path.join(self.save_to, "atelier_d3")
             
-            if save_as.lower() in ['webp', 'jpg']:
+            if save_as.lower() in _VALID_FORMATS:
                 self.save_as = save_as.lower()
             else:
                 self.logger.warning(f"Invalid save format '{save_as}', defaulting to WEBP")
                 self.save_as = 'webp'
+            
+            self.__save_webp = self.save_as == 'webp'
+            
+            if isinstance(webp_method, int) and 0 <= webp_method <= 6:
+                self.webp_method = webp_method
+            else:
+                self.logger.warning(f"Invalid WebP method '{webp_method}', defaulting to 0")
+                self.webp_method = 0
+            
+            if max_size is None or (isinstance(max_size, int) and max_size > 0):
+                self.max_size = max_size
+            else:
+                self.logger.warning(f"Invalid max size '{max_size}', keeping original size")
+                self.max_size = None
         
         except Exception as e:
             error = f"Error in init_checks: {e}"
             self.logger.error(error)
             raise RuntimeError(error)
    
-    def __online_check(self, url: str = 'https://www.google.com', timeout: int = 10):
+    def __online_check(self, url: str = 'https://www.gstatic.com/generate_204', timeout: int = 10):
         """
         Check if there is an active internet connection.
         """
         try:
-            requests.get(url, timeout=timeout)
+            self.__session.head(url, timeout=timeout)
         
         except Exception as e:
             error = f"No internet connection available! Please check your network connection."
@@ -80,13 +119,7 @@ class AtelierD3Client():
     
     def __load_preset(self, preset_path='__dtr__.py'):
         try: 
-            with open(resources.path(__name__, preset_path), 'r', encoding="utf-8") as f:
-                __preset = json.load(f)
-            
-            self.__se = base64.b64decode(__preset["locale"][0]).decode('utf-8')
-            self.__au = base64.b64decode(__preset["locale"][1]).decode('utf-8')
-            self.__us = base64.b64decode(__preset["locale"][2]).decode('utf-8')
-            self.__pa = base64.b64decode(__preset["locale"][3]).decode('utf-8')
+            self.__se, self.__au, self.__us, self.__pa = _load_preset_cached(preset_path)
         
         except Exception as e:
             error = f"Error in load_preset: {e}"
@@ -99,40 +132,111 @@ class AtelierD3Client():
             options.add_argument('--disable-gpu')
             options.add_argument("--headless=new")
             options.add_argument('--disable-blink-features=AutomationControlled')
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_argument('--disable-extensions')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
             options.add_experimental_option("excludeSwitches", ["ignore-certificate-errors"])
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
             
             try:
                 self.logger.info('Attempting to use system ChromeDriver!')
-                return webdriver.Chrome(options=options)
+                driver = webdriver.Chrome(options=options)
             
             except WebDriverException as e:
-                self.logger.info('System ChromeDriver not found or incompatible, downloading appropriate version!')
-                service = Service(ChromeDriverManager().install())
-                return webdriver.Chrome(service=service, options=options)
+                self.logger.info('System ChromeDriver not found or incompatible, using managed version!')
+                driver = self.__get_managed_webdriver(options)
             
-            finally:
-                self.logger.info('Webdriver is ready!')
+            self.__widen_driver_pool(driver)
+            self.logger.info('Webdriver is ready!')
+            return driver
         
         except Exception as e:
             error = f"Error in get_webdriver: {e}"
             self.logger.error(error)
             raise RuntimeError(error)
 
+    def __get_managed_webdriver(self, options):
+        """
+        Start Chrome with the cached ChromeDriver path, and only fall back to
+        webdriver-manager when the cache is missing, stale or incompatible.
+        """
+        try:
+            with open(_DRIVER_CACHE, 'r', encoding="utf-8") as f:
+                cached_path = f.read().strip()
+        
+        except OSError:
+            cached_path = None
+        
+        if cached_path and os.access(cached_path, os.X_OK):
+            try:
+                self.logger.info('Using cached ChromeDriver!')
+                return webdriver.Chrome(service=Service(cached_path), options=options)
+            
+            except WebDriverException:
+                self.logger.info('Cached ChromeDriver is incompatible, downloading appropriate version!')
+        
+        driver_path = ChromeDriverManager().install()
+        
+        try:
+            os.makedirs(os.path.dirname(_DRIVER_CACHE), exist_ok=True)
+            with open(_DRIVER_CACHE, 'w', encoding="utf-8") as f:
+                f.write(driver_path)
+        
+        except OSError as e:
+            self.logger.warning(f"Unable to cache ChromeDriver path: {e}")
+        
+        return webdriver.Chrome(service=Service(driver_path), options=options)
+
+    def __widen_driver_pool(self, driver, maxsize: int = 10):
+        """
+        Raise the urllib3 pool size used to talk to chromedriver (default 1),
+        so concurrent commands reuse connections instead of dropping them.
+        """
+        pool_manager = getattr(driver.command_executor, '_conn', None)
+        
+        if pool_manager is not None:
+            pool_manager.connection_pool_kw['maxsize'] = maxsize
+            pool_manager.clear()
+
     def __authenticate(self):
         try:
             self.__driver.get(self.__au)
             
-            step_a = WebDriverWait(self.__driver, 15).until(EC.visibility_of_element_located((By.ID, "i0116")))
-            step_a.send_keys(self.__us)
-            
-            step_b = WebDriverWait(self.__driver, 15).until(EC.element_to_be_clickable((By.ID, "idSIButton9")))
-            step_b.click()
-            
-            step_c = WebDriverWait(self.__driver, 15).until(EC.visibility_of_element_located((By.ID, "i0118")))
-            step_c.send_keys(self.__pa)
+            result = self.__driver.execute_async_script("""
+                var username = arguments[0], password = arguments[1], timeout = arguments[2];
+                var done = arguments[arguments.length - 1];
+                
+                function waitFor(id, next) {
+                    var deadline = Date.now() + timeout;
+                    var timer = setInterval(function () {
+                        var el = document.getElementById(id);
+                        if (el && el.offsetParent !== null && !el.disabled) { clearInterval(timer); next(el); }
+                        else if (Date.now() > deadline) { clearInterval(timer); done(id); }
+                    }, 100);
+                }
+                
+                function fill(el, value) {
+                    el.focus();
+                    el.value = value;
+                    el.dispatchEvent(new Event('input', {bubbles: true}));
+                    el.dispatchEvent(new Event('change', {bubbles: true}));
+                }
+                
+                waitFor('i0116', function (step_a) {
+                    fill(step_a, username);
+                    waitFor('idSIButton9', function (step_b) {
+                        step_b.click();
+                        waitFor('i0118', function (step_c) {
+                            fill(step_c, password);
+                            waitFor('idSIButton9', function (step_d) { step_d.click(); done(true); });
+                        });
+                    });
+                });
+            """, self.__us, self.__pa, 15000)
             
-            step_d = WebDriverWait(self.__driver, 15).until(EC.element_to_be_clickable((By.ID, "idSIButton9")))
-            step_d.click()
+            if result is not True:
+                raise Exception(f"Sign-in step '{result}' did not become available in time!")
             
             step_e = WebDriverWait(self.__driver, 15).until(EC.element_to_be_clickable((By.ID, "acceptButton")))
             step_e.click()
@@ -162,12 +266,12 @@ class AtelierD3Client():
     def __get_task_id(self):
         """
         Generate a unique task ID for request tracking.
-        Returns a truncated UUID (8 characters).
+        Returns a timestamp with an 8-character hex counter.
         """
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            uuid_part = str(uuid.uuid4())[:8]
-            task_id = f"{timestamp}_{uuid_part}"
+            timestamp = time.strftime('%Y%m%d_%H%M%S')
+            counter_part = next(self.__task_counter) & 0xFFFFFFFF
+            task_id = f"{timestamp}_{counter_part:08x}"
             
             self.logger.info(f"[{task_id}] Created task id from request!")
             return task_id
@@ -177,39 +281,80 @@ class AtelierD3Client():
             self.logger.error(error)
             raise RuntimeError(error)
                  
-    def __save_image(self, url: str, task_id, index: int = 1) -> str:
-        """Helper function to save an image from a URL to a temporary file."""
+    def __stream_to_file(self, url: str, file_path: str):
+        """Helper function to stream a URL's response body straight to disk."""
+        with self.__session.get(url, stream=True) as response:
+            response.raw.decode_content = True
+            
+            with open(file_path, 'wb') as output:
+                shutil.copyfileobj(response.raw, output)
+    
+    def __prep_outdir(self, task_id) -> str:
+        """Helper function to create the dated output directory for a task."""
         try:
             date_part = task_id.split('_')[0]
             formatted_date = f"{date_part[:4]}-{date_part[4:6]}-{date_part[6:8]}"
         
             output_dir = os.path.join(self.save_to, formatted_date)
             os.makedirs(output_dir, exist_ok=True)
-            
-            response = requests.get(url)
-            
-            if self.save_as == 'webp':
-                try:                
-                    img = Image.open(BytesIO(response.content))
+            return output_dir
+        
+        except Exception as e:
+            error = f"[{task_id}] Error in prep_outdir: {e}"
+            self.logger.error(error)
+            raise RuntimeError(error)
+    
+    def __save_image(self, url: str, task_id, output_dir: str, index: int = 1) -> str:
+        """Helper function to save an image from a URL to a temporary file."""
+        try:
+            if self.__save_webp:
+                webp_path = os.path.join(output_dir, f"{task_id}_{index}.webp")
+                file_path = None
+                
+                with self.__session.get(url, stream=True) as response:
+                    response.raw.decode_content = True
                     
-                    webp_buffer = BytesIO()
-                    img.save(webp_buffer, format='WebP', quality=90)
-                    content = webp_buffer.getvalue()
-                    suffix = '.webp'
+                    if 'webp' in response.headers.get('Content-Type', ''):
+                        try:
+                            with open(webp_path, 'wb') as output:
+                                shutil.copyfileobj(response.raw, output)
+                        
+                        except Exception:
+                            if os.path.exists(webp_path):
+                                os.remove(webp_path)
+                            raise
+                        
+                        file_path = webp_path
                     
-                except Exception as e:
-                    self.logger.warning(f"[{task_id}] Failed to convert to WebP, falling back to JPG!")
-                    content = response.content
-                    suffix = '.jpg'
+                    else:
+                        try:
+                            # Pillow buffers non-seekable streams itself, so the full body is read into memory here.
+                            img = Image.open(response.raw)
+                            
+                            if self.max_size:
+                                img.draft('RGB', (self.max_size, self.max_size))
+                                img.thumbnail((self.max_size, self.max_size))
+                            else:
+                                img.draft('RGB', img.size)
+                                img.load()
+                            
+                            with open(webp_path, 'wb') as output:
+                                img.save(output, format='WebP', quality=85, method=self.webp_method)
+                            
+                            file_path = webp_path
+                        
+                        except Exception as e:
+                            self.logger.warning(f"[{task_id}] Failed to convert to WebP, falling back to JPG!")
+                            if os.path.exists(webp_path):
+                                os.remove(webp_path)
+                
+                if file_path is None:
+                    # The original body was consumed by the failed transcode, so fetch it again.
+                    file_path = os.path.join(output_dir, f"{task_id}_{index}.jpg")
+                    self.__stream_to_file(url, file_path)
             else:
-                content = response.content
-                suffix = '.jpg'
-
-            filename = f"{task_id}_{index}{suffix}"
-            file_path = os.path.join(output_dir, filename)
-            
-            with open(file_path, 'wb') as output:
-                output.write(content)
+                file_path = os.path.join(output_dir, f"{task_id}_{index}.jpg")
+                self.__stream_to_file(url, file_path)
                 
             self.logger.info(f"[{task_id}] Saved output: {file_path}")
             return file_path
@@ -219,10 +364,52 @@ class AtelierD3Client():
             self.logger.error(error)
             raise RuntimeError(error)
 
+    def __save_images(self, urls: list, task_id, output_dir: str) -> list:
+        """Helper function to download and save multiple images concurrently."""
+        futures = [self.__dl_pool.submit(self.__save_image, url, task_id, output_dir, idx) for idx, url in enumerate(urls, 1)]
+        return [filename for future in futures if (filename := future.result())]
+
+    def __open_page(self, url: str):
+        """Helper function to navigate to a URL unless the driver is already on it."""
+        if self.__last_url != url:
+            self.__driver.get(url)
+            self.__last_url = url
+
+    def __await_element(self, selector: str):
+        """Helper function to wait in-page until an element matching selector is attached."""
+        self.__driver.execute_async_script("""
+            var selector = arguments[0], done = arguments[arguments.length - 1];
+            if (document.querySelector(selector)) { done(true); return; }
+            new MutationObserver(function (mutations, observer) {
+                if (document.querySelector(selector)) { observer.disconnect(); done(true); }
+            }).observe(document.documentElement, {childList: true, subtree: true});
+        """, selector)
+
+    def __get_image_urls(self, selector: str, scope: str = None, child: str = None) -> list:
+        """
+        Helper function to collect query-less image sources in one call.
+        Matches selector inside the first scope element (or the whole page),
+        taking the first child element of each match when child is given.
+        """
+        return self.__driver.execute_script("""
+            var selector = arguments[0], scope = arguments[1], child = arguments[2];
+            var root = scope ? document.querySelector(scope) : document;
+            if (!root) { return []; }
+            
+            return Array.from(root.querySelectorAll(selector)).map(function (el) {
+                return child ? el.querySelector(child) : el;
+            }).filter(function (img) {
+                return img && img.src;
+            }).map(function (img) {
+                var query = img.src.indexOf('?');
+                return query < 0 ? img.src : img.src.substring(0, query);
+            });
+        """, selector, scope, child)
+
     def __v1(self, prompt, task_id) -> list:
         try:
-            self.__driver.get(self.__se)
-            self.__driver.refresh()
+            self.__open_page(self.__se)
+            self.__last_url = None
             
             self.__driver.find_element(By.ID, "sb_form_q").send_keys(prompt)
             self.__driver.find_element(By.ID, "create_btn_c").click()
@@ -235,33 +422,33 @@ class AtelierD3Client():
                 pass
 
             saved_images = []
-            while True:
-                self.logger.info(f"[{task_id}] Refreshing request!")
-                self.__driver.refresh()
-
-                try:
-                    WebDriverWait(self.__driver, 15).until(EC.presence_of_element_located((By.CLASS_NAME, "img_cont")))
-                    divs = self.__driver.find_elements(By.CLASS_NAME, "img_cont")
-                    urls = [div.find_element(By.TAG_NAME, "img").get_attribute("src").split("?")[0] for div in divs]
-                    self.logger.info(f'[{task_id}] Found {len(urls)} images!')
-                    
-                    for idx, url in enumerate(urls, 1):
-                        if filename := self.__save_image(url, task_id, idx):
-                            saved_images.append(filename)
-                    return saved_images
+            self.logger.info(f"[{task_id}] Waiting for request!")
+            
+            try:
+                self.__await_element(".img_cont, .gir_mmimg")
+            
+            except TimeoutException:
+                raise Exception(f'[{task_id}] Unable to find images!')
+            
+            output_dir = self.__prep_outdir(task_id)
+            urls = self.__get_image_urls(".img_cont", child="img")
+            
+            if urls:
+                self.logger.info(f'[{task_id}] Found {len(urls)} images!')
                 
-                except TimeoutException:
-                    try:
-                        img = self.__driver.find_element(By.CLASS_NAME, "gir_mmimg")
-                        src = img.get_attribute("src").split("?")[0]
-                        self.logger.info(f'[{task_id}] Found 1 image!')
-                        
-                        if filename := self.__save_image(src, task_id):
-                            saved_images.append(filename)
-                        return saved_images
-                    
-                    except NoSuchElementException:
-                        raise Exception(f'[{task_id}] Unable to find images!')
+                saved_images.extend(self.__save_images(urls, task_id, output_dir))
+                return saved_images
+            
+            urls = self.__get_image_urls(".gir_mmimg")[:1]
+            
+            if not urls:
+                raise Exception(f'[{task_id}] Unable to find images!')
+            
+            self.logger.info(f'[{task_id}] Found 1 image!')
+            
+            if filename := self.__save_image(urls[0], task_id, output_dir):
+                saved_images.append(filename)
+            return saved_images
         
         except Exception as e:
             error = f"[{task_id}] {e}"
@@ -270,8 +457,8 @@ class AtelierD3Client():
 
     def __v2(self, prompt, task_id) -> list:
         try:
-            self.__driver.get(self.__se)
-            self.__driver.refresh()
+            self.__open_page(self.__se)
+            self.__last_url = None
             
             self.__driver.find_element(By.ID, "sb_form_q").send_keys(prompt)
             self.__driver.find_element(By.ID, "create_btn_c").click()
@@ -283,39 +470,32 @@ class AtelierD3Client():
             except TimeoutException:
                 pass
 
-            while True:
-                self.logger.info(f"[{task_id}] Refreshing request!")
-                self.__driver.refresh()
-
-                try:
-                    grid = WebDriverWait(self.__driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.girrgrid.light.seled"))
-                    )
-                    
-                    saved_images = []
-                    try:
-                        images = grid.find_elements(By.CLASS_NAME, "_4-images")
-                        
-                        if images:
-                            urls = [img.get_attribute("src").split("?")[0] for img in images]
-                            self.logger.info(f'[{task_id}] Found {len(urls)} images!')
-                        
-                        else:
-                            img = grid.find_element(By.CLASS_NAME, "_1-images")
-                            urls = [img.get_attribute("src").split("?")[0]]
-                            self.logger.info(f'[{task_id}] Found 1 image!')
-                        
-                        for idx, url in enumerate(urls, 1):
-                            if filename := self.__save_image(url, task_id, idx):
-                                saved_images.append(filename)
-                        
-                        return saved_images
-                    
-                    except NoSuchElementException:
-                        raise Exception(f'[{task_id}] Unable to find images!')
-                        
-                except TimeoutException:
-                    raise Exception(f'[{task_id}] Unable to find target element in time!')
+            self.logger.info(f"[{task_id}] Waiting for request!")
+            
+            try:
+                self.__await_element("div.girrgrid.light.seled")
+            
+            except TimeoutException:
+                raise Exception(f'[{task_id}] Unable to find target element in time!')
+            
+            output_dir = self.__prep_outdir(task_id)
+            
+            saved_images = []
+            urls = self.__get_image_urls("._4-images", scope="div.girrgrid.light.seled")
+            
+            if urls:
+                self.logger.info(f'[{task_id}] Found {len(urls)} images!')
+            
+            else:
+                urls = self.__get_image_urls("._1-images", scope="div.girrgrid.light.seled")[:1]
+                
+                if not urls:
+                    raise Exception(f'[{task_id}] Unable to find images!')
+                
+                self.logger.info(f'[{task_id}] Found 1 image!')
+            
+            saved_images.extend(self.__save_images(urls, task_id, output_dir))
+            return saved_images
         
         except Exception as e:
             error = f"[{task_id}] {e}"
@@ -324,8 +504,7 @@ class AtelierD3Client():
         
     def generate_image(self, prompt):
         try:
-            self.__driver.get(self.__se)
-            self.__driver.refresh()
+            self.__open_page(self.__se)
             
             try:
                 task_id = self.__get_task_id()
@@ -340,4 +519,26 @@ class AtelierD3Client():
         except Exception as e:
             error = f"[{task_id}] Error in generate_image: {e}"
             self.logger.error(error)
-            raise RuntimeError(error)
\ No newline at end of file
+            raise RuntimeError(error)
+
+    def close(self):
+        """
+        Release the webdriver and HTTP session held by the client.
+        """
+        try:
+            if self.__driver:
+                self.__driver.quit()
+                self.__driver = None
+            
+            if self.__dl_pool:
+                self.__dl_pool.shutdown(wait=True)
+                self.__dl_pool = None
+            
+            if self.__session:
+                self.__session.close()
+                self.__session = None
+        
+        except Exception as e:
+            error = f"Error in close: {e}"
+            self.logger.error(error)
+            raise RuntimeError(error)